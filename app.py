@@ -1,116 +1,293 @@
+import hashlib
+import os
+import tempfile
 import numpy as np
 import streamlit as st
 import pandas as pd
-from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from email.utils import formatdate
+from functools import wraps
+from http.client import HTTPException
+from pathlib import Path
+from typing import Callable
+from urllib.error import HTTPError
+from urllib.request import Request, urlopen
 
 import plotly.graph_objects as go
+import plotly.io as pio
 import matplotlib
+import orjson
+
+# Figures are serialized once per baseline and tab, orjson encodes the numeric arrays without a Python loop
+pio.json.config.default_engine = 'orjson'
+_PLASMA = matplotlib.colormaps.get_cmap('plasma')
+# Hex colors of every plasma colormap entry, shared by all figures
+_PLASMA_HEX = [matplotlib.colors.rgb2hex(color) for color in _PLASMA(np.arange(_PLASMA.N))]
+PARQUET_CACHE_DIR = Path.home() / '.cache' / 'toasty-times'
+FIGURE_HEIGHT = 500
+# Baseline year ranges kept in memory across all sections, users tend to move back and forth between a few.
+# The cached figures take about 1 MB each, so this bounds them to roughly 60 MB per process.
+MAX_CACHED_BASELINES = 16
+
+
+def interpolate_missing_dates(df: pd.DataFrame) -> pd.DataFrame:
+    min_year = df['date'].dt.year.min()
+    max_year = df['date'].dt.year.max()
+    full_date_range = pd.date_range(start=f'{min_year}-01-01', end=f'{max_year}-12-31')
+    df = df.set_index('date').reindex(full_date_range).rename_axis('date').reset_index()
+    dates = full_date_range.to_numpy()
+    df['day_of_year'] = (dates - dates.astype('datetime64[Y]')).astype('timedelta64[D]').astype('int16') + 1
+    # float32 halves the cached frames and, as customdata is base64 encoded, the figure data too
+    df['value'] = df['value'].interpolate(method='linear', limit_area='inside').astype('float32')
+    return df
 
 
-@st.cache_data(ttl=timedelta(hours=1))
+def is_modified_since(url: str, timestamp: float) -> bool:
+    # Servers that ignore If-Modified-Since answer with 200, which just means downloading the data again
+    if not url.startswith(('http://', 'https://')):
+        return True
+    request = Request(url, method='HEAD', headers={'If-Modified-Since': formatdate(timestamp, usegmt=True)})
+    try:
+        with urlopen(request, timeout=10):
+            return True
+    except HTTPError as error:
+        return error.code != 304
+    except (OSError, HTTPException):  # Also timeouts and dropped connections
+        return True
+
+
+def read_cached_parquet(path: Path) -> pd.DataFrame | None:
+    # A missing or truncated file just means downloading the data again
+    try:
+        return pd.read_parquet(path)
+    except (OSError, ValueError):
+        try:
+            path.unlink(missing_ok=True)
+        except OSError:
+            pass
+        return None
+
+
+def persist_to_parquet(fetch: Callable[[str], pd.DataFrame]) -> Callable[[str], pd.DataFrame]:
+    # Keeps the parsed data on disk for the current UTC hour, so new processes don't have to download it again.
+    # After that hour, the previous file is reused if the server reports the data hasn't changed since.
+    @wraps(fetch)
+    def wrapper(url: str) -> pd.DataFrame:
+        url_hash = hashlib.md5(url.encode()).hexdigest()
+        path = PARQUET_CACHE_DIR / f"{url_hash}_{datetime.now(timezone.utc).strftime('%Y%m%d%H')}.parquet"
+        df = read_cached_parquet(path)
+        if df is not None:
+            return df
+        previous_path = max(PARQUET_CACHE_DIR.glob(f'{url_hash}_*.parquet'), default=None)
+        if previous_path is not None:
+            try:
+                # Another worker may have renamed or removed the file since the glob
+                reusable = not is_modified_since(url, previous_path.stat().st_mtime)
+                if reusable:
+                    previous_path.replace(path)  # Keeps the mtime of the download for the next check
+            except OSError:
+                reusable = False
+            if reusable:
+                df = read_cached_parquet(path)
+                if df is not None:
+                    return df
+        df = fetch(url)
+        try:
+            PARQUET_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            # Written next to the final file and moved into place, so other workers never read a partial file
+            file_descriptor, temp_path = tempfile.mkstemp(dir=PARQUET_CACHE_DIR, prefix=f'{url_hash}_', suffix='.tmp')
+            os.close(file_descriptor)
+            try:
+                df.to_parquet(temp_path, compression='zstd')
+                os.replace(temp_path, path)
+            except OSError:
+                Path(temp_path).unlink(missing_ok=True)
+                raise
+            for stale_path in PARQUET_CACHE_DIR.glob(f'{url_hash}_*.parquet'):
+                if stale_path != path:
+                    stale_path.unlink(missing_ok=True)
+        except OSError:
+            pass  # The on-disk cache is only an optimization
+        return df
+
+    return wrapper
+
+
+@st.cache_resource(ttl=timedelta(hours=1), show_spinner=False)
+@persist_to_parquet
 def get_nsidc_daily_ice_data(url: str) -> pd.DataFrame:
-    df = pd.read_csv(url, skipinitialspace=True, skiprows=[1])
+    # The pyarrow engine can't skip the units row by index, so the header is skipped along with it
+    df = pd.read_csv(url, engine='pyarrow', header=None, skiprows=2, usecols=[0, 1, 2, 3],
+                     names=['Year', 'Month', 'Day', 'Extent'],
+                     dtype={'Year': 'int16', 'Month': 'int8', 'Day': 'int8', 'Extent': 'float32'})
     df['date'] = pd.to_datetime(df[['Year', 'Month', 'Day']])
-    df['day_of_year'] = df['date'].dt.dayofyear
     df['value'] = df['Extent']
-    df['date_formatted'] = df['date'].dt.strftime('%Y-%m-%d')
-    df = df[['date', 'day_of_year', 'value', 'date_formatted']]
-    return df
+    df = df[['date', 'value']]
+    return interpolate_missing_dates(df)
 
 
-@st.cache_data(ttl=timedelta(hours=1))
+@st.cache_resource(ttl=timedelta(hours=1), show_spinner=False)
+@persist_to_parquet
 def get_climate_reanalyzer_daily_data(url: str) -> pd.DataFrame:
-    df = pd.read_json(url)
-    df = df[df['name'].str.isnumeric()].set_index('name').data.apply(pd.Series).stack().reset_index(name='value')
-    df.columns = ['Year', 'Day', 'value']
-    df['Year'] = df['Year'].astype(int)
-    df['Day'] = df['Day'].astype(int) + 1  # To correct zero-based indexing
-    df['date'] = pd.to_datetime(df['Year'].astype(str) + '-' + df['Day'].astype(str), format='%Y-%j')
-    df['day_of_year'] = df['Day']
-    df['date_formatted'] = df['date'].dt.strftime('%Y-%m-%d')
-    df = df[['date', 'day_of_year', 'value', 'date_formatted']]
-    return df
+    with urlopen(url) as response:
+        series = orjson.loads(response.read())
+    series = [year_series for year_series in series if year_series['name'].isnumeric()]
+    year_values = [np.array(year_series['data'], dtype='float64') for year_series in series]  # None becomes NaN
+    days_per_year = [len(values) for values in year_values]
+    years = np.repeat([int(year_series['name']) for year_series in series], days_per_year)
+    days = np.concatenate([np.arange(1, n + 1) for n in days_per_year])  # To correct zero-based indexing
+    values = np.concatenate(year_values)
+    present = ~np.isnan(values)
+    df = pd.DataFrame({'Year': years[present], 'Day': days[present], 'value': values[present]})
+    year_starts = (df['Year'].to_numpy() - 1970).astype('datetime64[Y]').astype('datetime64[D]')
+    df['date'] = (year_starts + (df['Day'].to_numpy() - 1).astype('timedelta64[D]')).astype('datetime64[ns]')
+    df = df[['date', 'value']]
+    return interpolate_missing_dates(df)
+
+
+@st.cache_data(ttl=timedelta(hours=1))
+def get_cumulative_daily_sums(url: str, data_version: str,
+                              _df: pd.DataFrame) -> tuple[int, np.ndarray, np.ndarray, np.ndarray]:
+    # Running totals over the years of the daily counts, sums and sums of squares. The totals of any baseline
+    # range are the difference of two rows, so moving the slider doesn't have to scan the data again.
+    years = _df['date'].dt.year.to_numpy()
+    first_year = int(years[0])
+    n_years = int(years[-1]) - first_year + 1
+    values = _df['value'].to_numpy(dtype='float64')
+    present = ~np.isnan(values)
+    index = (years[present] - first_year) * 367 + _df['day_of_year'].to_numpy()[present]
+    totals = [np.bincount(index, weights=weights, minlength=n_years * 367).reshape(n_years, 367)
+              for weights in (None, values[present], values[present] ** 2)]
+    counts, sums, squares = [np.vstack([np.zeros((1, 367)), np.cumsum(total, axis=0)]) for total in totals]
+    return first_year, counts, sums, squares
+
+
+@st.cache_data(ttl=timedelta(hours=1), max_entries=MAX_CACHED_BASELINES)
+def get_anomalies_and_sigmas(url: str, data_version: str, start_year: int, end_year: int,
+                             _df: pd.DataFrame) -> tuple[np.ndarray, np.ndarray]:
+    # _df is not hashed, the url together with the data version identifies the frame
+    first_year, counts, sums, squares = get_cumulative_daily_sums(url, data_version, _df)
+    start = np.clip(start_year - first_year, 0, len(counts) - 1)
+    end = np.clip(end_year - first_year + 1, 0, len(counts) - 1)
+    count = counts[end] - counts[start]
+    total = sums[end] - sums[start]
+    day_of_year = _df['day_of_year'].to_numpy()
+    with np.errstate(invalid='ignore', divide='ignore'):
+        daily_mean = total / count
+        # Sample std, as in pandas. Rounding can make a zero variance slightly negative.
+        daily_variance = np.maximum(squares[end] - squares[start] - total * daily_mean, 0) / (count - 1)
+        daily_variance[count < 2] = np.nan
+        anomaly = _df['value'].to_numpy(dtype='float64') - daily_mean[day_of_year]
+        sigma = anomaly / np.sqrt(daily_variance)[day_of_year]
+    return anomaly.astype('float32'), sigma.astype('float32')
+
+
+HOVER_COLUMNS = ['value', 'anomaly', 'sigma']
+
+
+@st.cache_resource(ttl=timedelta(hours=1), max_entries=MAX_CACHED_BASELINES)
+def get_base_figure(url: str, data_version: str, start_year: int, end_year: int, current_year: int, title_short: str,
+                    template: str, _df: pd.DataFrame, _years: np.ndarray, _year_starts: np.ndarray) -> go.Figure:
+    # The traces carry all plotted columns in customdata, get_figure_html picks the y values from there.
+    # customdata stays a numeric float32 array, so Plotly ships it base64 encoded, the dates go in text.
+    fig = go.Figure()
+    hover_template = "<br>".join([
+        "<b>Date</b>: %{text}",
+        f"<b>{title_short}</b>: %{{customdata[0]:.2f}}",
+        "<b>Anomaly</b>: %{customdata[1]:.2f}",
+        "<b>Sigma</b>: %{customdata[2]:.2f}"])
+
+    for i, year in enumerate(_years):
+        year_data = _df.iloc[_year_starts[i]:_year_starts[i + 1]]
+        hover_dates = year_data['date'].to_numpy().astype('datetime64[D]').astype('U10')
+        if year == current_year:
+            style = dict(line=dict(color='red', width=3))
+        else:
+            style = dict(line=dict(color=_PLASMA_HEX[int(i / len(_years) * _PLASMA.N)]), opacity=0.3)
+        fig.add_trace(go.Scattergl(x=year_data['day_of_year'],
+                                   mode='lines',
+                                   name=str(year),
+                                   hovertemplate=hover_template,
+                                   text=hover_dates,
+                                   customdata=year_data[HOVER_COLUMNS].to_numpy(dtype='float32'),
+                                   **style))
+
+    # The figures are embedded as plain HTML, so the template follows the Streamlit theme type and the
+    # transparent backgrounds let the page show through
+    fig.update_layout(xaxis_title='Day of Year',
+                      legend={'traceorder': 'reversed'},
+                      template=template,
+                      paper_bgcolor='rgba(0, 0, 0, 0)',
+                      plot_bgcolor='rgba(0, 0, 0, 0)')
+    return fig
+
+
+@st.cache_resource(ttl=timedelta(hours=1), max_entries=3 * MAX_CACHED_BASELINES)  # One figure per tab
+def get_figure_html(url: str, data_version: str, start_year: int, end_year: int, current_year: int, title: str,
+                    title_short: str, yaxis_title: str, y_axis_column: str, template: str, _df: pd.DataFrame,
+                    _years: np.ndarray, _year_starts: np.ndarray) -> str:
+    # Only the serialized figure is kept, so reruns don't have to convert it to JSON again.
+    # The anomaly and sigma columns of _df depend on the baseline years, which are part of the key.
+    fig = go.Figure(get_base_figure(url, data_version, start_year, end_year, current_year, title_short, template,
+                                    _df, _years, _year_starts))
+    column_index = HOVER_COLUMNS.index(y_axis_column)
+    fig.for_each_trace(lambda trace: trace.update(y=trace.customdata[:, column_index].astype('float32')))
+    fig.update_layout(title=title,
+                      yaxis_title=yaxis_title)
+    return pio.to_html(fig, include_plotlyjs='cdn', full_html=False, default_height=FIGURE_HEIGHT,
+                       config={'responsive': True})
 
 
 class DataSourceSection:
-    def __init__(self, url, title, title_short, y_axis_unit):
+    URL: str
+    fetch_function: Callable[[str], pd.DataFrame]
+
+    def __init__(self, url, title, title_short, y_axis_unit, df=None):
         self.url = url
         self.title = title
         self.title_short = title_short
         self.y_axis_unit = y_axis_unit
         self.default_year_range = (1991, 2020)
-        self.df = None
-        self.fetch_data()
-        self.interpolate_missing_dates()
+        self.df = df
+        self.baseline_years = self.default_year_range
+        if self.df is None:
+            self.fetch_data()
+        # The fetched frame is shared by all sessions, the anomaly columns are only added to this section's copy
+        self.df = self.df.copy(deep=False)
+        # The dates are a complete daily range, so every year is a contiguous slice of the frame
+        self.years = np.arange(self.df['date'].iloc[0].year, self.df['date'].iloc[-1].year + 1)
+        year_boundaries = np.append(self.years, self.years[-1] + 1) - 1970
+        self._year_starts = np.searchsorted(self.df['date'].to_numpy(), year_boundaries.astype('datetime64[Y]'))
+        # Sources revise values without adding rows, so the cache keys use a digest of the data itself
+        self.data_version = hashlib.md5(self.df['date'].to_numpy().tobytes()
+                                        + self.df['value'].to_numpy().tobytes()).hexdigest()
         self.generate_layout()
 
     def fetch_data(self):
-        raise NotImplementedError
-
-    def interpolate_missing_dates(self):
-        min_year = self.df['date'].dt.year.min()
-        max_year = self.df['date'].dt.year.max()
-        full_date_range = pd.date_range(start=f'{min_year}-01-01', end=f'{max_year}-12-31')
-        df_full_range = pd.DataFrame(full_date_range, columns=['date'])
-        self.df = pd.merge(df_full_range, self.df, on='date', how='left')
-        self.df['day_of_year'] = self.df['date'].dt.dayofyear
-        self.df['value'] = self.df['value'].interpolate(method='linear', limit_area='inside')
-        self.df['date_formatted'] = self.df['date'].dt.strftime('%Y-%m-%d')
+        self.df = self.fetch_function(self.url)
 
     def calculate_anomalies_and_sigmas(self, start_year, end_year):
-        df_range = self.df[(self.df['date'].dt.year >= start_year) & (self.df['date'].dt.year <= end_year)]
-        averages = df_range.groupby(df_range['date'].dt.dayofyear)['value'].mean()
-        daily_sigma = df_range.groupby(df_range['date'].dt.dayofyear)['value'].std()
-        self.df['anomaly'] = self.df.apply(
-            lambda row: row['value'] - averages[row['day_of_year']] if row['day_of_year'] in averages.index else np.NaN,
-            axis=1)
-        self.df['sigma'] = self.df.apply(
-            lambda row: (row['anomaly']) / daily_sigma[row['day_of_year']] if
-            row['day_of_year'] in averages.index else np.NaN, axis=1)
-
-    def prepare_figure(self, title, yaxis_title, y_axis_column):
-        current_year = datetime.now().year
-        fig = go.Figure()
-        years = self.df['date'].dt.year.unique()
-        cmap = matplotlib.colormaps.get_cmap('plasma')
-        hover_template = "<br>".join([
-            "<b>Date</b>: %{customdata[0]}",
-            f"<b>{self.title_short}</b>: %{{customdata[1]:.2f}}",
-            "<b>Anomaly</b>: %{customdata[2]:.2f}",
-            "<b>Sigma</b>: %{customdata[3]:.2f}"])
-
-        for i, year in enumerate(years):
-            color = matplotlib.colors.rgb2hex(cmap(i / len(years)))
-            year_data = self.df[self.df['date'].dt.year == year]
-            hover_custom_data = year_data[['date_formatted', 'value', 'anomaly', 'sigma']]
-            if year == current_year:
-                fig.add_trace(go.Scatter(x=year_data['day_of_year'],
-                                         y=year_data[y_axis_column],
-                                         mode='lines',
-                                         name=str(year),
-                                         line=dict(color='red', width=3),
-                                         hovertemplate=hover_template,
-                                         customdata=hover_custom_data))
-            else:
-                fig.add_trace(go.Scatter(x=year_data['day_of_year'],
-                                         y=year_data[y_axis_column],
-                                         mode='lines',
-                                         name=str(year),
-                                         line=dict(color=color),
-                                         opacity=0.3,
-                                         hovertemplate=hover_template,
-                                         customdata=hover_custom_data))
-
-        fig.update_layout(title=title,
-                          xaxis_title='Day of Year',
-                          yaxis_title=yaxis_title,
-                          legend={'traceorder': 'reversed'})
-        return fig
+        self.baseline_years = (start_year, end_year)
+        self.df['anomaly'], self.df['sigma'] = get_anomalies_and_sigmas(
+            self.url, self.data_version, start_year, end_year, self.df)
+
+    def prepare_figure_html(self, title, yaxis_title, y_axis_column):
+        start_year, end_year = self.baseline_years
+        # The theme type is unknown until the browser reports it, Streamlit starts out light by default
+        template = 'plotly_dark' if st.context.theme.type == 'dark' else 'plotly_white'
+        return get_figure_html(self.url, self.data_version, start_year, end_year, datetime.now().year,
+                               title, self.title_short, yaxis_title, y_axis_column, template, self.df, self.years,
+                               self._year_starts)
+
+    def show_figure(self, title, yaxis_title, y_axis_column):
+        # Leave some room for the margin of the iframe body
+        st.iframe(self.prepare_figure_html(title, yaxis_title, y_axis_column), height=FIGURE_HEIGHT + 20)
 
     def generate_layout(self):
         st.header(self.title)
-        data_min_year = int(self.df['date'].dt.year.min())
-        data_max_year = int(self.df['date'].dt.year.max())
+        data_min_year = int(self.years[0])
+        data_max_year = int(self.years[-1])
         year_range_min, year_range_max = st.slider(
             'Select the multi-year baseline for anomalies and sigmas', data_min_year,
             data_max_year,
@@ -118,33 +295,36 @@ class DataSourceSection:
             key=f'{self.title}_year_range')
         self.calculate_anomalies_and_sigmas(year_range_min, year_range_max)
 
+        # Only the selected tab runs, switching tabs triggers a rerun
         value_tab, anomaly_tab, sigma_tab = st.tabs([self.title_short,
                                                      f"{self.title_short} Anomaly",
-                                                     f"{self.title_short} Sigma"])
-        with value_tab:
-            full_y_axis_title = f'{self.title_short} ({self.y_axis_unit})'
-            fig = self.prepare_figure(self.title, full_y_axis_title, 'value')
-            st.plotly_chart(fig, use_container_width=True)
-        with anomaly_tab:
-            full_y_axis_title = f'{self.title_short} Anomaly ({self.y_axis_unit})'
-            anomalies_fig = self.prepare_figure(f'{self.title} Anomalies', full_y_axis_title, 'anomaly')
-            st.plotly_chart(anomalies_fig, use_container_width=True)
-            st.write(f'Anomaly is the difference from the daily average of selected years')
-        with sigma_tab:
-            full_y_axis_title = f'{self.title_short} Sigma'
-            anomalies_fig = self.prepare_figure(f'{self.title} Sigma', full_y_axis_title, 'sigma')
-            st.plotly_chart(anomalies_fig, use_container_width=True)
-            st.write(f'Sigma is the anomaly divided by the daily standard deviation of selected years')
+                                                     f"{self.title_short} Sigma"],
+                                                    key=f'{self.title}_tab',
+                                                    on_change='rerun')
+        if value_tab.open:
+            with value_tab:
+                full_y_axis_title = f'{self.title_short} ({self.y_axis_unit})'
+                self.show_figure(self.title, full_y_axis_title, 'value')
+        if anomaly_tab.open:
+            with anomaly_tab:
+                full_y_axis_title = f'{self.title_short} Anomaly ({self.y_axis_unit})'
+                self.show_figure(f'{self.title} Anomalies', full_y_axis_title, 'anomaly')
+                st.write(f'Anomaly is the difference from the daily average of selected years')
+        if sigma_tab.open:
+            with sigma_tab:
+                full_y_axis_title = f'{self.title_short} Sigma'
+                self.show_figure(f'{self.title} Sigma', full_y_axis_title, 'sigma')
+                st.write(f'Sigma is the anomaly divided by the daily standard deviation of selected years')
 
 
 class AntarcticSeaIceExtent(DataSourceSection):
-    def __init__(self):
-        super().__init__('https://noaadata.apps.nsidc.org/NOAA/G02135/south/daily/data/S_seaice_extent_daily_v3.0.csv',
-                         'Antarctic Sea Ice Extent',
-                         'Antarctic SIE', 'million square kilometers')
+    URL = 'https://noaadata.apps.nsidc.org/NOAA/G02135/south/daily/data/S_seaice_extent_daily_v3.0.csv'
+    fetch_function = staticmethod(get_nsidc_daily_ice_data)
 
-    def fetch_data(self):
-        self.df = get_nsidc_daily_ice_data(self.url)
+    def __init__(self, df=None):
+        super().__init__(self.URL,
+                         'Antarctic Sea Ice Extent',
+                         'Antarctic SIE', 'million square kilometers', df)
 
     def generate_layout(self):
         super().generate_layout()
@@ -157,13 +337,13 @@ class AntarcticSeaIceExtent(DataSourceSection):
 
 
 class ArcticSeaIceExtent(DataSourceSection):
-    def __init__(self):
-        super().__init__('https://noaadata.apps.nsidc.org/NOAA/G02135/north/daily/data/N_seaice_extent_daily_v3.0.csv',
-                         'Arctic Sea Ice Extent',
-                         'Arctic SIE', 'million square kilometers')
+    URL = 'https://noaadata.apps.nsidc.org/NOAA/G02135/north/daily/data/N_seaice_extent_daily_v3.0.csv'
+    fetch_function = staticmethod(get_nsidc_daily_ice_data)
 
-    def fetch_data(self):
-        self.df = get_nsidc_daily_ice_data(self.url)
+    def __init__(self, df=None):
+        super().__init__(self.URL,
+                         'Arctic Sea Ice Extent',
+                         'Arctic SIE', 'million square kilometers', df)
 
     def generate_layout(self):
         super().generate_layout()
@@ -176,13 +356,13 @@ class ArcticSeaIceExtent(DataSourceSection):
 
 
 class NorthAtlanticSST(DataSourceSection):
-    def __init__(self):
-        super().__init__('https://climatereanalyzer.org/clim/sst_daily/json/oisst2.1_natlan1_sst_day.json',
-                         'North Atlantic Sea Surface Temperature (0-60N, 0-80W)',
-                         'North Atlantic SST', '°C')
+    URL = 'https://climatereanalyzer.org/clim/sst_daily/json/oisst2.1_natlan1_sst_day.json'
+    fetch_function = staticmethod(get_climate_reanalyzer_daily_data)
 
-    def fetch_data(self):
-        self.df = get_climate_reanalyzer_daily_data(self.url)
+    def __init__(self, df=None):
+        super().__init__(self.URL,
+                         'North Atlantic Sea Surface Temperature (0-60N, 0-80W)',
+                         'North Atlantic SST', '°C', df)
 
     def generate_layout(self):
         super().generate_layout()
@@ -194,13 +374,13 @@ class NorthAtlanticSST(DataSourceSection):
 
 
 class WorldSST(DataSourceSection):
-    def __init__(self):
-        super().__init__('https://climatereanalyzer.org/clim/sst_daily/json/oisst2.1_world2_sst_day.json',
-                         'World Sea Surface Temperature (60S-60N)',
-                         'World SST', '°C')
+    URL = 'https://climatereanalyzer.org/clim/sst_daily/json/oisst2.1_world2_sst_day.json'
+    fetch_function = staticmethod(get_climate_reanalyzer_daily_data)
 
-    def fetch_data(self):
-        self.df = get_climate_reanalyzer_daily_data(self.url)
+    def __init__(self, df=None):
+        super().__init__(self.URL,
+                         'World Sea Surface Temperature (60S-60N)',
+                         'World SST', '°C', df)
 
     def generate_layout(self):
         super().generate_layout()
@@ -211,13 +391,13 @@ class WorldSST(DataSourceSection):
 
 
 class WorldTemp2m(DataSourceSection):
-    def __init__(self):
-        super().__init__('https://climatereanalyzer.org/clim/t2_daily/json_cfsr/cfsr_world_t2_day.json',
-                         'World 2m Air Temperature',
-                         'World 2m Temp', '°C')
+    URL = 'https://climatereanalyzer.org/clim/t2_daily/json_cfsr/cfsr_world_t2_day.json'
+    fetch_function = staticmethod(get_climate_reanalyzer_daily_data)
 
-    def fetch_data(self):
-        self.df = get_climate_reanalyzer_daily_data(self.url)
+    def __init__(self, df=None):
+        super().__init__(self.URL,
+                         'World 2m Air Temperature',
+                         'World 2m Temp', '°C', df)
 
     def generate_layout(self):
         super().generate_layout()
@@ -232,11 +412,14 @@ def main():
     st.title('🔥 Toasty Times 🔥')
     st.write('AKA the "I\'m not a climate scientist but I play one on the internet" dashboard')
 
-    NorthAtlanticSST()
-    WorldSST()
-    AntarcticSeaIceExtent()
-    ArcticSeaIceExtent()
-    WorldTemp2m()
+    sections = [NorthAtlanticSST, WorldSST, AntarcticSeaIceExtent, ArcticSeaIceExtent, WorldTemp2m]
+    # Download all data sources at once, the sections are still rendered in order on the main thread.
+    # The worker threads have no script context, so the fetch functions don't show their own spinners.
+    with st.spinner('Downloading the data...'), ThreadPoolExecutor(max_workers=len(sections)) as executor:
+        futures = [executor.submit(section.fetch_function, section.URL) for section in sections]
+        frames = [future.result() for future in futures]
+    for section, df in zip(sections, frames):
+        section(df=df)
 
     st.header('About')
     st.write(